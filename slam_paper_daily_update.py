@@ -1,8 +1,16 @@
 import os
 import re
+import math
 import time
-import base64
-import requests
+import json
+import heapq
+import random
+import shutil
+import functools
+import asyncio
+import httpx
+import orjson
+from operator import itemgetter
 from datetime import datetime
 from pathlib import Path
 
@@ -13,28 +21,164 @@ REPO_NAME = "SLAM-daily-update"              # 仓库名
 SEARCH_KEYWORDS = ["SLAM", "Simultaneous Localization and Mapping"]
 TARGET_CONF = ["icra", "iros", "ral", "tro"]  # 目标会议/期刊
 PROCESSED_FILE = "processed_repos.txt"    # 已处理仓库记录
+ETAG_FILE = "processed_etags.json"        # README的ETag及解析结果（关闭去重时用于条件请求）
 SKIP_EXISTED = True                       # 启用去重
 ONLY_NEW_UPDATED = False                  # 仅处理近期更新
+RECENT_DAYS = 7                           # 近期更新的天数范围
 TABLE_HEADER = """| 标题 | 作者 | 会议/期刊 | 年份 | 代码仓库 | 论文链接 |
 |------|------|-----------|------|----------|----------|"""
 TABLE_TEMPLATE = "| {title} | {authors} | {conf} | {year} | [{repo}]({repo_url}) | [{paper}]({paper_url}) |"
+TABLE_START = "<!-- PAPERS_TABLE_START -->"  # README中论文表格起始标记
+TABLE_END = "<!-- PAPERS_TABLE_END -->"      # README中论文表格结束标记
+COPY_BUFFER_SIZE = 64 * 1024              # 更新README时的流式复制缓冲区大小
+TABLE_MAX_ROWS = 50                       # README表格最多保留的论文数（按年份取最新）
+API_HEADERS = {
+    "Authorization": f"token {GITHUB_TOKEN}",
+    "Accept": "application/vnd.github.v3+json"
+}
+REQUEST_TIMEOUT = 30.0                    # 单次请求超时（秒）
+MAX_CONCURRENCY = 8                       # 并发处理仓库数（避免触发二级速率限制）
+MAX_RETRIES = 3                           # 5xx错误重试次数
+RETRY_STATUS = (500, 502, 503, 504)       # 需要重试的状态码
+SEARCH_PER_PAGE = 100                     # 搜索每页结果数
+SEARCH_MAX_RESULTS = 1000                 # GitHub搜索最多返回1000条
+SEARCH_CONCURRENCY = 5                    # 并发拉取的搜索页数
+RATE_LIMIT_THRESHOLD = 5                  # 剩余配额低于该值时等待重置
+RATE_LIMIT_RETRIES = 3                    # 触发速率限制(403/429)后的重试次数
+RETRY_BASE_DELAY = 2                      # 重试退避基数（秒）
+SECONDARY_RATE_LIMIT_DELAY = 60           # 二级速率限制未给出Retry-After时的等待时间（秒）
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 25                   # 单次GraphQL查询包含的仓库数
 # ===================================================
 
-def github_api_request(url, params=None):
-    """GitHub API请求（带异常处理）"""
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    try:
-        response = requests.get(url, headers=headers, params=params)
+# README元数据字段 {章节标题: 字段名}
+README_FIELDS = {
+    "📄 论文标题": "title",
+    "👥 作者": "authors",
+    "📅 会议/期刊": "conf",
+    "📆 发表年份": "year",
+    "📜 论文链接": "paper"
+}
+# 单次扫描匹配所有字段章节（预编译）
+README_PATTERN = re.compile(
+    r"##\s*(?P<hdr>" + "|".join(map(re.escape, README_FIELDS)) + r")\s*[:：]\s*"
+    r"(?P<val>[\s\S]+?)\s*(?=\n##|\Z)",
+    re.IGNORECASE
+)
+YEAR_PATTERN = re.compile(r"\d{4}")
+# 会议/期刊名 (小写匹配用, 大写展示用)
+TARGET_CONF_NAMES = tuple((conf.lower(), conf.upper()) for conf in TARGET_CONF)
+
+# 条件请求返回304（内容未变化）时的标记
+NOT_MODIFIED = object()
+# 各仓库README响应的ETag {仓库全名: ETag}（含本次运行新获取的）
+etag_cache = {}
+# 已写入表格仓库的README记录 {仓库全名: {"etag": ETag, "paper_info": 解析结果}}，304时复用解析结果
+readme_records = {}
+
+# 最近一次响应中的速率限制状态 {资源类型: (剩余次数, 重置时间戳)}
+rate_limit_state = {}
+
+def update_rate_limit(headers):
+    """记录响应头中的速率限制信息"""
+    if "X-RateLimit-Remaining" not in headers:
+        return
+    resource = headers.get("X-RateLimit-Resource", "core")
+    rate_limit_state[resource] = (
+        int(headers["X-RateLimit-Remaining"]),
+        int(headers.get("X-RateLimit-Reset", time.time()))
+    )
+
+async def wait_for_rate_limit(resource):
+    """剩余配额不足时等待至重置时间"""
+    remaining, reset_time = rate_limit_state.get(resource, (None, 0))
+    if remaining is not None and remaining < RATE_LIMIT_THRESHOLD:
+        delay = reset_time - time.time() + 1
+        if delay > 0:
+            print(f"{resource}配额剩余{remaining}次，等待{delay:.0f}秒")
+            await asyncio.sleep(delay)
+
+class RateLimitError(Exception):
+    """GitHub API速率限制异常"""
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def rate_limited(func):
+    """速率限制装饰器：配额不足时等待重置，403/429时按Retry-After或指数退避重试"""
+    @functools.wraps(func)
+    async def wrapper(client, url, *args, **kwargs):
+        if "/search/" in url:
+            resource = "search"
+        elif url == GRAPHQL_URL:
+            resource = "graphql"
+        else:
+            resource = "core"
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await wait_for_rate_limit(resource)
+            try:
+                return await func(client, url, *args, **kwargs)
+            except RateLimitError as e:
+                if attempt == RATE_LIMIT_RETRIES:
+                    raise
+                delay = e.retry_after or RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, 1)
+                print(f"{str(e)}，{delay:.0f}秒后重试({attempt + 1}/{RATE_LIMIT_RETRIES})")
+                await asyncio.sleep(delay)
+    return wrapper
+
+async def fetch_response(client, url, params=None, payload=None, headers=None, etag_key=None):
+    """发送请求并返回响应（有payload时POST，5xx错误指数退避重试）"""
+    # 指定etag_key时发送条件请求：304返回NOT_MODIFIED，200时记录新的ETag
+    headers = dict(headers or {})
+    if etag_key in etag_cache:
+        headers["If-None-Match"] = etag_cache[etag_key]
+    for attempt in range(MAX_RETRIES + 1):
+        if payload is None:
+            response = await client.get(url, params=params, headers=headers)
+        else:
+            response = await client.post(url, params=params, json=payload, headers=headers)
+        if response.status_code in RETRY_STATUS and attempt < MAX_RETRIES:
+            await asyncio.sleep(2 ** attempt)
+            continue
+        update_rate_limit(response.headers)
+        if response.status_code == 304:
+            return NOT_MODIFIED
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        if response.status_code == 403:
-            reset_time = int(response.headers.get("X-RateLimit-Reset", time.time()))
-            raise Exception(f"API速率限制，重置时间: {datetime.fromtimestamp(reset_time)}")
-        elif response.status_code == 404:
+        if etag_key is not None and "ETag" in response.headers:
+            etag_cache[etag_key] = response.headers["ETag"]
+        return response
+
+@rate_limited
+async def github_api_request(client, url, params=None, payload=None, etag_key=None, raw=False):
+    """GitHub API请求（带异常处理），返回orjson解析的JSON；raw=True时返回原始文本"""
+    headers = {"Accept": "application/vnd.github.raw"} if raw else None
+    try:
+        response = await fetch_response(client, url, params, payload, headers, etag_key)
+        if response is NOT_MODIFIED:
+            return NOT_MODIFIED
+        return response.text if raw else orjson.loads(response.content)
+    except httpx.HTTPStatusError as e:
+        status = e.response.status_code
+        headers = e.response.headers
+        # 二级速率限制常常既无Retry-After也未耗尽配额，只能从响应消息判断
+        is_secondary_limit = status == 429 or status == 403 and "secondary rate limit" in e.response.text.lower()
+        # 仅速率限制相关的403/429重试，权限不足等其他403直接返回
+        is_rate_limited = (
+            is_secondary_limit
+            or status == 403 and ("Retry-After" in headers or headers.get("X-RateLimit-Remaining") == "0")
+        )
+        if is_rate_limited:
+            reset_time = int(headers.get("X-RateLimit-Reset", time.time()))
+            if "Retry-After" in headers:
+                retry_after = int(headers["Retry-After"])
+            else:
+                # 二级限制按GitHub文档至少等待1分钟；一级配额耗尽由wait_for_rate_limit等待至重置
+                retry_after = SECONDARY_RATE_LIMIT_DELAY if is_secondary_limit else None
+            raise RateLimitError(f"API速率限制，重置时间: {datetime.fromtimestamp(reset_time)}", retry_after)
+        elif status == 403:
+            print(f"无权访问: {url}")
+            return None
+        elif status == 404:
             print(f"仓库不存在: {url}")
             return None
         else:
@@ -44,7 +188,7 @@ def github_api_request(url, params=None):
         print(f"请求异常: {str(e)}")
         return None
 
-def search_slam_repos():
+async def search_slam_repos(client):
     """搜索符合条件的GitHub仓库"""
     base_url = "https://api.github.com/search/repositories"
     query = (
@@ -54,171 +198,241 @@ def search_slam_repos():
         "-topic:documentation -topic:demo"
     )
     
-    all_repos = []
-    page = 1
-    while True:
-        params = {"q": query, "sort": "updated", "order": "desc", "per_page": 100, "page": page}
-        data = github_api_request(base_url, params)
+    def page_params(page):
+        return {"q": query, "sort": "updated", "order": "desc", "per_page": SEARCH_PER_PAGE, "page": page}
+    
+    # 第一页确定结果总数，后续页并发拉取
+    data = await github_api_request(client, base_url, page_params(1))
+    if not data or not data.get("items"):
+        return []
+    all_repos = list(data["items"])
+    print(f"已获取第1页，累计{len(all_repos)}个仓库")
+    
+    total_count = min(data.get("total_count", 0), SEARCH_MAX_RESULTS)
+    pages = math.ceil(total_count / SEARCH_PER_PAGE)
+    if pages <= 1:
+        return all_repos
+    
+    sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    
+    async def fetch_page(page):
+        async with sem:
+            return await github_api_request(client, base_url, page_params(page))
+    
+    results = await asyncio.gather(
+        *(fetch_page(page) for page in range(2, pages + 1)),
+        return_exceptions=True
+    )
+    for page, data in enumerate(results, start=2):
+        if isinstance(data, BaseException):
+            print(f"获取第{page}页失败: {str(data)}")
+            continue
         if not data or not data.get("items"):
-            break
-            
+            continue
         all_repos.extend(data["items"])
         print(f"已获取第{page}页，累计{len(all_repos)}个仓库")
-        
-        if len(data["items"]) < params["per_page"]:
-            break
-            
-        page += 1
-        time.sleep(1)  # 遵守API速率限制
     
     return all_repos
 
+async def fetch_readmes(client, repos):
+    """通过GraphQL批量获取README.md内容，返回{仓库全名: 文本}（未找到的仓库不在结果中）"""
+    async def fetch_batch(batch):
+        aliases = []
+        for i, repo in enumerate(batch):
+            owner, name = repo["full_name"].split("/", 1)
+            aliases.append(
+                f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                '{ object(expression: "HEAD:README.md") { ... on Blob { text } } }'
+            )
+        data = await github_api_request(client, GRAPHQL_URL, payload={"query": "query { " + " ".join(aliases) + " }"})
+        data = (data or {}).get("data") or {}
+        
+        readmes = {}
+        for i, repo in enumerate(batch):
+            blob = (data.get(f"r{i}") or {}).get("object") or {}
+            if blob.get("text") is not None:
+                readmes[repo["full_name"]] = blob["text"]
+        return readmes
+    
+    batches = [repos[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(repos), GRAPHQL_BATCH_SIZE)]
+    results = await asyncio.gather(*(fetch_batch(batch) for batch in batches), return_exceptions=True)
+    
+    readmes = {}
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"批量获取README失败: {str(result)}")
+            continue
+        readmes.update(result)
+    print(f"GraphQL批量获取{len(readmes)}/{len(repos)}个README")
+    return readmes
+
 def load_processed_repos():
-    """加载已处理仓库列表"""
+    """加载已处理仓库集合"""
     processed_path = Path(PROCESSED_FILE)
     if not processed_path.exists():
-        return []
+        return set()
     
     try:
         with open(processed_path, "r", encoding="utf-8") as f:
-            return [line.strip() for line in f if line.strip()]
+            return {line.strip() for line in f if line.strip()}
     except Exception as e:
         print(f"加载已处理仓库失败: {str(e)}")
-        return []
+        return set()
 
 def save_processed_repos(repos):
-    """保存已处理仓库列表（去重存储）"""
+    """保存已处理仓库集合（排序存储，先写临时文件再原子替换）"""
     try:
-        unique_repos = sorted(set(repos))
-        with open(PROCESSED_FILE, "w", encoding="utf-8") as f:
-            f.write("\n".join(unique_repos))
+        unique_repos = sorted(repos)
+        tmp_path = PROCESSED_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(name + "\n" for name in unique_repos)
+        os.replace(tmp_path, PROCESSED_FILE)
         print(f"已保存{len(unique_repos)}个已处理仓库记录")
     except Exception as e:
         print(f"保存已处理仓库失败: {str(e)}")
 
+def load_readme_records():
+    """加载已处理仓库的README记录（ETag及解析结果）"""
+    etag_path = Path(ETAG_FILE)
+    if not etag_path.exists():
+        return {}
+    
+    try:
+        with open(etag_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        # 格式不符（如旧版本的{仓库: ETag}）时整体丢弃，按无记录处理
+        valid = isinstance(records, dict) and all(
+            isinstance(record, dict)
+            and isinstance(record.get("etag"), str)
+            and isinstance(record.get("paper_info"), dict)
+            and set(README_FIELDS.values()) <= record["paper_info"].keys()
+            for record in records.values()
+        )
+        if not valid:
+            print("README记录格式无效，已忽略")
+            return {}
+        return records
+    except Exception as e:
+        print(f"加载README记录失败: {str(e)}")
+        return {}
+
+def save_readme_records(records):
+    """保存已处理仓库的README记录（先写临时文件再原子替换）"""
+    try:
+        tmp_path = ETAG_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, ETAG_FILE)
+    except Exception as e:
+        print(f"保存README记录失败: {str(e)}")
+
 def parse_readme(readme_content, repo_info):
     """从README解析论文元数据"""
-    patterns = {
-        "title": r"## 📄 论文标题\s*[:：]\s*([\s\S]+?)\s*(?=\n##|$)",
-        "authors": r"## 👥 作者\s*[:：]\s*([\s\S]+?)\s*(?=\n##|$)",
-        "conf": r"## 📅 会议/期刊\s*[:：]\s*([\s\S]+?)\s*(?=\n##|$)",
-        "year": r"## 📆 发表年份\s*[:：]\s*(\d{4})\s*(?=\n##|$)",
-        "paper": r"## 📜 论文链接\s*[:：]\s*([\s\S]+?)\s*(?=\n##|$)"
-    }
-    
-    result = {}
-    for key, pattern in patterns.items():
-        try:
-            match = re.search(pattern, readme_content, re.IGNORECASE)
-            result[key] = match.group(1).strip() if match else "未提供"
-        except Exception as e:
-            print(f"解析{key}失败: {str(e)}")
-            result[key] = "解析错误"
+    found = {}
+    for match in README_PATTERN.finditer(readme_content):
+        found.setdefault(README_FIELDS[match.group("hdr")], match.group("val").strip())
+    result = {key: found.get(key, "未提供") for key in README_FIELDS.values()}
+    if not YEAR_PATTERN.fullmatch(result["year"]):
+        result["year"] = "未提供"
     
     # 自动推断会议类型
-    if result["conf"] in ["未提供", "解析错误"]:
+    if result["conf"] == "未提供":
         desc_lower = (repo_info.get("description") or "").lower()
-        for conf in TARGET_CONF:
-            if conf in desc_lower:
-                result["conf"] = conf.upper()
-                break
-        else:
-            result["conf"] = "其他会议"
+        result["conf"] = next(
+            (upper for lower, upper in TARGET_CONF_NAMES if lower in desc_lower),
+            "其他会议"
+        )
     
     return result
 
+def copy_after_table(src, dst, has_end_marker):
+    """跳过src中的旧表格，把表格之后的内容复制到dst"""
+    if has_end_marker:
+        skipped = []
+        for line in src:
+            if line.strip() == TABLE_END:
+                shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                return
+            skipped.append(line)
+        # 缺少结束标记：以下一个章节标题作为表格结尾，找不到标题时保留起始标记后的全部内容
+        print("README表格缺少结束标记，以下一个章节标题作为表格结尾")
+        headings = [i for i, line in enumerate(skipped) if line.startswith("## ")]
+        dst.writelines(skipped[headings[0]:] if headings else skipped)
+        return
+    
+    # 无标记的旧表格（旧版本生成）：表格到下一个"## "章节标题为止
+    for line in src:
+        if line.startswith("## "):
+            dst.write(line)
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+            return
+
 def update_readme_table(rows):
-    """更新README中的论文表格"""
+    """更新README中的论文表格（流式复制表格外的内容，写临时文件后原子替换）"""
+    readme_path = Path("README.md")
+    tmp_path = Path("README.md.tmp")
     try:
-        readme_path = Path("README.md")
-        content = ""
-        
-        if readme_path.exists():
-            with open(readme_path, "r", encoding="utf-8") as f:
-                content = f.read()
+        table = f"{TABLE_START}\n{TABLE_HEADER}\n" + "\n".join(rows) + f"\n{TABLE_END}\n"
+        header_line = TABLE_HEADER.split("\n", 1)[0]
         
-        # 定位表格位置
-        start_idx = content.find(TABLE_HEADER)
-        if start_idx == -1:
-            # 添加新表格
-            content = f"# SLAM开源论文合集\n\n## 最新开源论文\n{TABLE_HEADER}\n" + "\n".join(rows)
-        else:
-            # 更新现有表格
-            end_idx = content.find("\n## ", start_idx)
-            if end_idx == -1:
-                end_idx = len(content)
-            content = content[:start_idx] + TABLE_HEADER + "\n" + "\n".join(rows) + content[end_idx:]
-        
-        with open(readme_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        with open(tmp_path, "w", encoding="utf-8") as dst:
+            if not readme_path.exists():
+                dst.write(f"# SLAM开源论文合集\n\n## 最新开源论文\n{table}")
+            else:
+                with open(readme_path, "r", encoding="utf-8") as src:
+                    # 复制表格之前的内容（定位起始标记，兼容无标记的旧表格）
+                    last_line = ""
+                    for line in src:
+                        if line.strip() == TABLE_START or line.rstrip("\n") == header_line:
+                            # 写入新表格，跳过旧表格，复制表格之后的内容
+                            dst.write(table)
+                            copy_after_table(src, dst, has_end_marker=line.strip() == TABLE_START)
+                            break
+                        dst.write(line)
+                        last_line = line
+                    else:
+                        # 未找到表格，在末尾添加新表格
+                        if last_line and not last_line.endswith("\n"):
+                            dst.write("\n")
+                        dst.write(f"\n## 最新开源论文\n{table}")
         
+        os.replace(tmp_path, readme_path)
         print(f"README更新完成，添加{len(rows)}篇论文")
         return True
     except Exception as e:
         print(f"更新README失败: {str(e)}")
+        tmp_path.unlink(missing_ok=True)
         return False
 
-def main():
-    # 1. 加载已处理仓库
-    processed_repos = load_processed_repos()
-    print(f"已加载{len(processed_repos)}个已处理仓库")
+async def process_repo(client, sem, repo, readme_content=None):
+    """处理单个仓库：解析README并生成(年份, 仓库全名, 表格行, 解析结果)，失败返回None"""
+    repo_fullname = repo["full_name"]
+    repo_url = repo["html_url"]
     
-    # 2. 搜索新仓库
-    print("搜索符合条件的新仓库...")
-    all_repos = search_slam_repos()
-    if not all_repos:
-        print("未找到符合条件的仓库")
-        return
-    
-    # 3. 过滤仓库（去重+时间过滤）
-    new_repos = []
-    for repo in all_repos:
-        repo_fullname = repo["full_name"]
-        
-        # 跳过已处理的仓库
-        if SKIP_EXISTED and repo_fullname in processed_repos:
-            continue
-            
-        # 时间过滤（可选）
-        if ONLY_NEW_UPDATED:
-            updated_at = datetime.strptime(repo["updated_at"], "%Y-%m-%dT%H:%M:%SZ")
-            if (datetime.now() - updated_at).days > 7:
-                continue
-                
-        new_repos.append(repo)
-    
-    if not new_repos:
-        print("无新仓库需要处理")
-        return
-    print(f"发现{len(new_repos)}个新仓库待处理")
-    
-    # 4. 处理新仓库
-    table_rows = []
-    processed_in_this_run = []
-    for repo in new_repos[:50]:  # 限制50个防止超时
-        repo_fullname = repo["full_name"]
-        repo_url = repo["html_url"]
-        
+    async with sem:
         try:
-            # 获取仓库详情
-            repo_detail = github_api_request(f"https://api.github.com/repos/{repo_fullname}")
-            if not repo_detail:
-                print(f"跳过无法获取详情的仓库: {repo_fullname}")
-                continue
-                
-            # 获取README内容
-            readme_content = ""
-            default_branch = repo_detail.get("default_branch", "main")
-            readme_resp = github_api_request(
-                f"https://api.github.com/repos/{repo_fullname}/contents/README.md",
-                {"ref": default_branch}
-            )
+            # GraphQL未取到README.md时回退REST接口（/readme自动定位默认分支及任意大小写的README文件）
+            # raw媒体类型直接返回README原文，无需base64解码
+            if readme_content is None:
+                readme_content = await github_api_request(
+                    client,
+                    f"https://api.github.com/repos/{repo_fullname}/readme",
+                    etag_key=repo_fullname,
+                    raw=True
+                )
+                if readme_content is None:
+                    # 获取失败时不生成表格行，仓库不记为已处理，下次运行重试
+                    print(f"跳过无法获取README的仓库: {repo_fullname}")
+                    return None
             
-            if readme_resp and "content" in readme_resp:
-                readme_content = base64.b64decode(readme_resp["content"]).decode("utf-8")
-            
-            # 解析论文信息
-            paper_info = parse_readme(readme_content, repo)
+            if readme_content is NOT_MODIFIED:
+                # README未变化，复用上次的解析结果
+                paper_info = readme_records[repo_fullname]["paper_info"]
+                print(f"README未变化，复用解析结果: {repo_fullname}")
+            else:
+                # 解析论文信息（放到线程池执行，避免阻塞事件循环）
+                loop = asyncio.get_running_loop()
+                paper_info = await loop.run_in_executor(None, parse_readme, readme_content, repo)
             
             # 生成表格行
             table_row = TABLE_TEMPLATE.format(
@@ -231,25 +445,98 @@ def main():
                 paper=paper_info["paper"],
                 paper_url=paper_info["paper"]
             )
-            table_rows.append(table_row)
-            processed_in_this_run.append(repo_fullname)
             print(f"成功处理: {repo_fullname} ({paper_info['conf']} {paper_info['year']})")
-            
-            time.sleep(0.5)  # 控制请求频率
+            year = int(paper_info["year"]) if paper_info["year"].isdigit() else 0
+            return year, repo_fullname, table_row, paper_info
             
         except Exception as e:
             print(f"处理仓库 {repo_fullname} 时出错: {str(e)}")
+            return None
+
+async def main():
+    # 1. 加载已处理仓库
+    processed_repos = load_processed_repos()
+    print(f"已加载{len(processed_repos)}个已处理仓库")
+    # 启用去重时已处理仓库不会再次获取README，条件请求用不上，无需加载README记录
+    if not SKIP_EXISTED:
+        readme_records.update(load_readme_records())
+        etag_cache.update({repo_fullname: record["etag"] for repo_fullname, record in readme_records.items()})
+    
+    # HTTP/2多路复用：并发请求共用同一条TLS连接
+    limits = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+    async with httpx.AsyncClient(http2=True, headers=API_HEADERS, limits=limits, timeout=REQUEST_TIMEOUT) as client:
+        # 2. 搜索新仓库
+        print("搜索符合条件的新仓库...")
+        all_repos = await search_slam_repos(client)
+        if not all_repos:
+            print("未找到符合条件的仓库")
+            return
+        
+        # 3. 过滤仓库（去重+时间过滤）
+        processed_set = processed_repos if SKIP_EXISTED else set()
+        cutoff = time.time() - RECENT_DAYS * 86400
+        
+        def is_recent(repo):
+            updated_at = datetime.fromisoformat(repo["updated_at"].replace("Z", "+00:00"))
+            return updated_at.timestamp() >= cutoff
+        
+        # 先对仓库名做集合差，再按时间过滤
+        new_names = {repo["full_name"] for repo in all_repos} - processed_set
+        new_repos = [
+            repo for repo in all_repos
+            if repo["full_name"] in new_names
+            and (not ONLY_NEW_UPDATED or is_recent(repo))
+        ]
+        
+        if not new_repos:
+            print("无新仓库需要处理")
+            return
+        print(f"发现{len(new_repos)}个新仓库待处理")
+        
+        # 4. 并发处理新仓库
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
+        batch = new_repos[:TABLE_MAX_ROWS]  # 限制数量防止超时，也不获取写不进表格的README
+        readmes = await fetch_readmes(client, batch)
+        results = await asyncio.gather(
+            *(process_repo(client, sem, repo, readmes.get(repo["full_name"])) for repo in batch),
+            return_exceptions=True
+        )
+    
+    # 用最小堆保留年份最新的TABLE_MAX_ROWS行，避免全量排序
+    # 同年份按搜索结果顺序（最近更新在前）排列，多数README没有年份时也有确定的次序
+    heap = []
+    for index, (repo, result) in enumerate(zip(batch, results)):
+        if isinstance(result, BaseException):
+            print(f"处理仓库 {repo['full_name']} 时出错: {str(result)}")
+            continue
+        if result is None:
+            continue
+        year, repo_fullname, table_row, paper_info = result
+        item = (year, -index, repo_fullname, table_row, paper_info)
+        if len(heap) < TABLE_MAX_ROWS:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
     
     # 5. 更新README和记录
-    if table_rows:
-        # 按年份降序排序
-        table_rows.sort(key=lambda x: int(re.search(r"\d{4}", x).group()), reverse=True)
+    if heap:
+        # 按年份降序、搜索顺序升序排序
+        table_rows = sorted(heap, key=itemgetter(0, 1), reverse=True)
+        # 仅记录写入表格的仓库
+        processed_in_this_run = [repo_fullname for _, _, repo_fullname, _, _ in table_rows]
         
-        if update_readme_table(table_rows):
+        if update_readme_table([row for _, _, _, row, _ in table_rows]):
             # 更新已处理记录
-            new_processed = processed_repos + processed_in_this_run
-            save_processed_repos(new_processed)
+            processed_repos.update(processed_in_this_run)
+            save_processed_repos(processed_repos)
+            if not SKIP_EXISTED:
+                # 每次运行都重新处理全部候选仓库，README记录只保留本次写入表格的仓库
+                save_readme_records({
+                    repo_fullname: {"etag": etag_cache[repo_fullname], "paper_info": paper_info}
+                    for _, _, repo_fullname, _, paper_info in table_rows
+                    if repo_fullname in etag_cache
+                })
             print(f"已保存{len(processed_in_this_run)}个新处理记录")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())